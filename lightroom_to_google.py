@@ -1,38 +1,289 @@
 """Syncs photos from an Adobe Lightroom gallery to a Google Drive folder."""
 
-import io
+from __future__ import annotations
+
+import atexit
+import hashlib
 import json
 import os
+import re
+import sqlite3
 import tempfile
-from typing import Dict, Any
+import threading
+import time
+import uuid
+from contextlib import closing, contextmanager, suppress
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 import zipfile
 import click
-from googleapiclient.http import MediaFileUpload
-from googleapiclient.discovery import build, Resource
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery_cache import DISCOVERY_DOC_MAX_AGE
+from googleapiclient.discovery_cache.base import Cache
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
+from urllib3.util.retry import Retry
 from tqdm import tqdm
 
+# The Google client and auth libraries take a few hundred milliseconds to
+# import, so they are imported where they are used. That keeps --help and URL
+# validation fast.
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource
+    from google.oauth2.credentials import Credentials
+
+try:
+    from isal import isal_zlib
+except ImportError:  # isal is an optional speed-up
+    isal_zlib = None  # pylint: disable=invalid-name
+
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_RETRIES = 5
+BATCH_CREATE_SIZE = 50
+HOST_POOLS = 4
+SIMPLE_UPLOAD_MAX_SIZE = 5 * 1024 * 1024
+DRIVE_MULTIPART_UPLOAD_URL = (
+    "https://www.googleapis.com/upload/drive/v3/files?uploadType=multipart&fields=id"
+)
+DRIVE_RESUMABLE_UPLOAD_URL = (
+    "https://www.googleapis.com/upload/drive/v3/files?uploadType=resumable&fields=id"
+)
+# Random, so it cannot plausibly occur inside the photo bytes
+MULTIPART_BOUNDARY = f"lightroom-sync-{uuid.uuid4().hex}"
+# Multipart framing is the same for every photo, so it is built once
+_MULTIPART_CONTENT_TYPE = f"multipart/related; boundary={MULTIPART_BOUNDARY}"
+_MULTIPART_METADATA_HEADER = (
+    f"--{MULTIPART_BOUNDARY}\r\n"
+    "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+).encode("ascii")
+_MULTIPART_PHOTO_HEADER = (
+    f"\r\n--{MULTIPART_BOUNDARY}\r\nContent-Type: image/jpeg\r\n\r\n"
+).encode("ascii")
+_MULTIPART_END = f"\r\n--{MULTIPART_BOUNDARY}--".encode("ascii")
+MANIFEST_PATH = ".lr_sync_state.db"
+# Also accepts a trailing slash, query string, fragment or asset sub-path
+GALLERY_URL_RE = re.compile(
+    r"^https?://lightroom\.adobe\.com/gallery/([^/?#]+)"
+    r"/albums/([^/?#]+)/assets(?:[/?#]|$)"
+)
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "lightroom_sync")
+ALBUM_CACHE_PATH = os.path.join(CACHE_DIR, "albums.json")
+
+if isal_zlib is not None:
+    # ISA-L's SIMD inflate and CRC-32 are drop-in replacements for zlib's
+    zipfile.zlib = isal_zlib
+    # zipfile binds crc32 as a module global at import, so swap it separately
+    zipfile.crc32 = isal_zlib.crc32
+
+# Loaded once per process by get_google_credentials / get_google_service
+_CREDS: Optional[Credentials] = None
+_CREDS_INITIAL_TOKEN: Optional[str] = None
+_SERVICES: Dict[Tuple[str, str], Resource] = {}
+# Upload workers share one Credentials object, so refreshes are serialised
+_REFRESH_LOCK = threading.Lock()
+
+
+def make_http_adapter(pool_size: int) -> HTTPAdapter:
+    """Returns a retrying HTTPS adapter keeping ``pool_size`` connections per host.
+
+    The pool blocks when exhausted, so upload workers wait for a kept-alive
+    connection instead of opening and discarding extra ones.
+    """
+    return HTTPAdapter(
+        # Number of per-host pools, not connections: the Drive and Photos
+        # hosts are used at the same time and must not evict each other
+        pool_connections=HOST_POOLS,
+        pool_maxsize=pool_size,
+        pool_block=True,
+        # Uploads are POSTs and PUTs, which urllib3 does not retry by default.
+        # Seekable bodies, including ZIP entries, are rewound before a retry.
+        max_retries=Retry(
+            total=MAX_RETRIES,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["GET", "POST", "PUT"]),
+            raise_on_status=False,
+        ),
+    )
+
+
+# Shared keep-alive session so uploads reuse TCP/TLS connections; main resizes
+# its pool to match --concurrency
+_SESSION = requests.Session()
+_SESSION.mount("https://", make_http_adapter(8))
+
+
+def download_zip(
+    url: str, zip_path: str, stop: Optional[threading.Event] = None
+) -> None:
+    """Downloads a ZIP file from a URL to ``zip_path``.
+
+    The archive is streamed to disk in chunks rather than held in memory, so
+    peak memory use stays flat regardless of the gallery size. Setting
+    ``stop`` abandons the download after the current chunk.
+    """
+    with requests.get(url, stream=True, timeout=(10, 120)) as response:
+        response.raise_for_status()
+        with open(zip_path, "wb") as zip_file:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                if stop is not None and stop.is_set():
+                    return
+                zip_file.write(chunk)
+
+
+def list_jpegs(zip_file: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """Returns the JPEG entries of a ZIP file.
+
+    The entries carry each photo's name, size and CRC from the central
+    directory, so callers never need to stat or re-read a photo to get them.
+    """
+    return [
+        info for info in zip_file.infolist() if info.filename.lower().endswith(".jpg")
+    ]
+
+
+class UploadManifest:
+    """Records which gallery photos have already been uploaded where.
+
+    Backed by a small SQLite database so that re-running a sync only uploads
+    photos that are new or have changed. Entries are keyed by Lightroom
+    gallery and album, file name and destination, and store the entry's size
+    and CRC-32 from the ZIP's central directory to detect changed photos.
+    """
+
+    def __init__(self, gallery_id: str, album_id: str, path: str = MANIFEST_PATH):
+        self.gallery_id = gallery_id
+        self.album_id = album_id
+        # Shared by the upload worker threads, so access is serialised
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS uploaded (
+                gallery TEXT,
+                album TEXT,
+                filename TEXT,
+                size INTEGER,
+                crc INTEGER,
+                destination TEXT,
+                remote_id TEXT,
+                PRIMARY KEY (gallery, album, filename, destination)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def is_uploaded(self, info: zipfile.ZipInfo, destination: str) -> bool:
+        """Returns whether this exact photo was already uploaded."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT remote_id FROM uploaded WHERE gallery = ? AND album = ? "
+                "AND filename = ? AND destination = ? AND size = ? AND crc = ?",
+                (
+                    self.gallery_id,
+                    self.album_id,
+                    os.path.basename(info.filename),
+                    destination,
+                    info.file_size,
+                    info.CRC,
+                ),
+            ).fetchone()
+        return row is not None
+
+    def add(self, info: zipfile.ZipInfo, destination: str, remote_id: str) -> None:
+        """Records a successful upload."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO uploaded VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.gallery_id,
+                    self.album_id,
+                    os.path.basename(info.filename),
+                    info.file_size,
+                    info.CRC,
+                    destination,
+                    remote_id,
+                ),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Closes the underlying database connection."""
+        self._conn.close()
+
+
+@contextmanager
+def open_per_thread(zip_path: str) -> Iterator[Callable[[zipfile.ZipInfo], IO[bytes]]]:
+    """Yields a function that opens ZIP entries through per-thread handles.
+
+    A single ``ZipFile`` serialises every read behind one lock. Giving each
+    upload worker its own handle on the archive lets entries be read and
+    inflated fully in parallel. All handles are closed on exit.
+    """
+    local = threading.local()
+    handles = []
+
+    def open_entry(info: zipfile.ZipInfo) -> IO[bytes]:
+        if not hasattr(local, "zip_file"):
+            local.zip_file = zipfile.ZipFile(  # pylint: disable=consider-using-with
+                zip_path
+            )
+            handles.append(local.zip_file)
+        entry = local.zip_file.open(info)
+        # requests otherwise sizes a body by seeking to its end, which for a ZIP
+        # entry inflates and CRC-checks the whole photo before sending it. It
+        # reads a ``len`` attribute first, and seek/tell still let urllib3
+        # rewind the entry before a retry.
+        entry.len = info.file_size
+        return entry
 
-def download_and_extract_zip(url: str, extract_to: str) -> None:
-    """Downloads and extracts a ZIP file from a URL."""
     try:
-        response = requests.get(url, timeout=10)
-        assert response.status_code == 200, f"Error: {response.status_code}"
-    except requests.exceptions.RequestException as exc:
-        print(f"Error: {exc}")
-        return
+        yield open_entry
+    finally:
+        for handle in handles:
+            handle.close()
 
-    with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
-        zip_file.extractall(extract_to)
-    print("Download and extraction complete.")
 
+def get_google_credentials() -> Credentials:
+    """Returns the Google OAuth credentials, loading them on first use."""
+    global _CREDS, _CREDS_INITIAL_TOKEN  # pylint: disable=global-statement
+    if _CREDS is None:
+        _CREDS, _CREDS_INITIAL_TOKEN = _load_google_credentials()
+        # The token may also be refreshed mid-run, so it is saved on exit
+        atexit.register(_save_google_credentials)
+    return _CREDS
+
+
+def _save_google_credentials() -> None:
+    """Writes the credentials to 'token.json' if their token has changed."""
+    if _CREDS is not None and _CREDS.token != _CREDS_INITIAL_TOKEN:
+        with open("token.json", "w", encoding="utf-8") as token:
+            token.write(_CREDS.to_json())
+
+
+def _load_google_credentials() -> Tuple[Credentials, Optional[str]]:
+    """Loads, refreshes or creates the Google OAuth credentials.
+
+    Returns:
+        Tuple[Credentials, Optional[str]]: The credentials, and the access
+            token they were stored with, if any.
+    """
+    # pylint: disable=import-outside-toplevel
+    from google.oauth2.credentials import Credentials
+    from google.auth.transport.requests import Request
+    from google_auth_oauthlib.flow import InstalledAppFlow
 
-def get_google_service(service_name, service_version) -> Resource:
-    """Sets up the Google Drive API client."""
     scopes = [
         "https://www.googleapis.com/auth/drive",
         "https://www.googleapis.com/auth/photoslibrary",
@@ -47,6 +298,7 @@ def get_google_service(service_name, service_version) -> Resource:
         creds = Credentials.from_authorized_user_info(json.loads(token_json_str), scopes)
     elif os.path.exists("token.json"):
         creds = Credentials.from_authorized_user_file("token.json", scopes)
+    stored_token = creds.token if creds else None
 
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
@@ -60,38 +312,285 @@ def get_google_service(service_name, service_version) -> Resource:
                 flow = InstalledAppFlow.from_client_secrets_file("credentials.json", scopes)
             creds = flow.run_local_server(port=0)
 
-    # Save or update token
-    with open("token.json", "w", encoding="utf-8") as token:
-        token.write(creds.to_json())
+    return creds, stored_token
+
+
+def _write_cache_file(path: str, content: str) -> None:
+    """Replaces a cache file with ``content``, if the cache is writable.
+
+    The file is written aside and renamed into place, so a concurrent run
+    never reads a half-written file. Caches only save time, so a failed
+    write, e.g. under a read-only home directory, is ignored.
+    """
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+            cache_file.write(content)
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path is not None:
+            with suppress(OSError):
+                os.unlink(tmp_path)
+
+
+class DiscoveryFileCache(Cache):
+    """Keeps fetched discovery documents on disk between runs."""
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(CACHE_DIR, "discovery", f"{digest}.json")
+
+    def get(self, url: str) -> Optional[str]:
+        path = self._path(url)
+        try:
+            if time.time() - os.path.getmtime(path) > DISCOVERY_DOC_MAX_AGE:
+                return None
+            with open(path, "r", encoding="utf-8") as cache_file:
+                return cache_file.read()
+        except OSError:
+            return None
+
+    def set(self, url: str, content: str) -> None:
+        _write_cache_file(self._path(url), content)
+
+
+def get_google_service(service_name, service_version) -> Resource:
+    """Sets up a Google API client, reusing it on subsequent calls.
+
+    Uses the discovery document bundled with googleapiclient when there is
+    one. Others, such as the Photos Library API's, are fetched once and then
+    served from a file cache on later runs.
+    """
+    # pylint: disable=import-outside-toplevel
+    from googleapiclient.discovery import build
+    from googleapiclient.errors import UnknownApiNameOrVersion
+
+    key = (service_name, service_version)
+    if key not in _SERVICES:
+        creds = get_google_credentials()
+        try:
+            _SERVICES[key] = build(service_name, service_version, credentials=creds)
+        except UnknownApiNameOrVersion:
+            _SERVICES[key] = build(
+                service_name,
+                service_version,
+                credentials=creds,
+                static_discovery=False,
+                cache=DiscoveryFileCache(),
+            )
+    return _SERVICES[key]
+
 
-    return build(
-        service_name, service_version, credentials=creds, static_discovery=False
+def is_rate_limited(response: requests.Response) -> bool:
+    """Returns whether a response is Drive's 403 asking the caller to slow down.
+
+    Drive reports per-user and per-project rate limits as 403s rather than
+    429s, so the session's retry does not cover them.
+    """
+    if response.status_code != 403:
+        return False
+    try:
+        errors = response.json()["error"]["errors"]
+    except (ValueError, KeyError, TypeError):
+        return False
+    return any(
+        error.get("reason") in ("rateLimitExceeded", "userRateLimitExceeded")
+        for error in errors
     )
 
 
-def upload_files_to_drive(service: Resource, folder_id: str, directory: str) -> None:
-    """Uploads files from a directory to a Google Drive folder."""
-    files = [f for f in os.listdir(directory) if f.endswith(".jpg")]
-    print(f"Uploading {len(files)} files to Google Drive...")
+def drive_multipart_upload(
+    creds: Credentials, folder_id: str, name: str, photo: IO[bytes]
+) -> str:
+    """Uploads a photo to a Google Drive folder in one multipart request.
 
-    for filename in tqdm(files, desc="Uploading"):
-        file_metadata = {"name": filename, "parents": [folder_id]}
-        media = MediaFileUpload(f"{directory}/{filename}", mimetype="image/jpeg")
-        service.files().create(
-            body=file_metadata, media_body=media, fields="id"
-        ).execute()
+    Talks to the Drive upload endpoint directly, skipping googleapiclient's
+    per-call request building and validation. The photo is read into memory,
+    so this is meant for photos under ``SIMPLE_UPLOAD_MAX_SIZE``. Rate-limit
+    403s are retried with exponential backoff.
+
+    Returns:
+        str: ID of the new Drive file.
+    """
+    metadata = json.dumps({"name": name, "parents": [folder_id]}).encode("utf-8")
+    body = b"".join(
+        [
+            _MULTIPART_METADATA_HEADER,
+            metadata,
+            _MULTIPART_PHOTO_HEADER,
+            photo.read(),
+            _MULTIPART_END,
+        ]
+    )
+    for attempt in range(MAX_RETRIES + 1):
+        if attempt:
+            time.sleep(2**attempt)
+        response = _SESSION.post(
+            DRIVE_MULTIPART_UPLOAD_URL,
+            headers={
+                "Authorization": f"Bearer {fresh_token(creds)}",
+                "Content-Type": _MULTIPART_CONTENT_TYPE,
+            },
+            data=body,
+            timeout=120,
+        )
+        if not is_rate_limited(response):
+            break
+    response.raise_for_status()
+    return response.json()["id"]
 
 
-def get_google_token() -> str:
-    """Returns the token from the 'token.json' file."""
-    get_google_service("drive", "v3")
-    with open("token.json", "r", encoding="utf-8") as token_file:
-        return json.load(token_file)["token"]
+def drive_resumable_upload(
+    creds: Credentials, folder_id: str, name: str, photo: IO[bytes], size: int
+) -> str:
+    """Uploads a photo to a Google Drive folder through a resumable session.
+
+    The photo is streamed, not buffered. A 429 or 5xx is retried by the
+    shared session, which rewinds ``photo`` before re-sending it. If the
+    connection drops instead, the upload session is asked how many bytes it
+    kept and the upload resumes from the next one.
+
+    Returns:
+        str: ID of the new Drive file.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        if attempt:
+            time.sleep(2**attempt)
+        response = _SESSION.post(
+            DRIVE_RESUMABLE_UPLOAD_URL,
+            headers={
+                "Authorization": f"Bearer {fresh_token(creds)}",
+                "X-Upload-Content-Type": "image/jpeg",
+                "X-Upload-Content-Length": str(size),
+            },
+            json={"name": name, "parents": [folder_id]},
+            timeout=120,
+        )
+        if not is_rate_limited(response):
+            break
+    response.raise_for_status()
+    session_url = response.headers["Location"]
+
+    offset = 0
+    for attempt in range(MAX_RETRIES + 1):
+        photo.seek(offset)
+        try:
+            response = _SESSION.put(
+                session_url,
+                headers={"Content-Range": f"bytes {offset}-{size - 1}/{size}"},
+                data=photo,
+                timeout=120,
+            )
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == MAX_RETRIES:
+                raise
+            time.sleep(2**attempt)
+            # An empty PUT reports how much of the photo the session has kept
+            response = _SESSION.put(
+                session_url, headers={"Content-Range": f"bytes */{size}"}, timeout=120
+            )
+        if response.status_code != 308:
+            response.raise_for_status()
+            return response.json()["id"]
+        # 308 means incomplete; Range is "bytes=0-<last kept byte>" if any were kept
+        kept = response.headers.get("Range")
+        offset = int(kept.rsplit("-", 1)[1]) + 1 if kept else 0
+    raise RuntimeError(f"Upload of {name} to Google Drive did not complete")
+
+
+def upload_files_to_drive(  # pylint: disable=too-many-arguments,too-many-locals
+    creds: Credentials,
+    folder_id: str,
+    zip_path: str,
+    photos: List[zipfile.ZipInfo],
+    *,
+    manifest: UploadManifest,
+    concurrency: int = 4,
+    position: Optional[int] = None,
+) -> None:
+    """Uploads JPEG entries of a ZIP file to a Google Drive folder.
+
+    ``photos`` are read straight out of the archive, so nothing is extracted
+    to disk. Photos already recorded in ``manifest`` are skipped. Uploads run
+    on a pool of ``concurrency`` threads, each with its own handle on the
+    archive. Small photos are sent in one multipart request; large ones are
+    streamed through a resumable upload session. ``position`` pins the
+    progress bar to a line when another pass runs alongside.
+    """
+    destination = f"drive:{folder_id}"
+    files = [info for info in photos if not manifest.is_uploaded(info, destination)]
+    tqdm.write(f"Uploading {len(files)} new files to Google Drive...")
+
+    def upload_one(info: zipfile.ZipInfo) -> None:
+        name = os.path.basename(info.filename)
+        with open_entry(info) as photo:
+            if info.file_size < SIMPLE_UPLOAD_MAX_SIZE:
+                file_id = drive_multipart_upload(creds, folder_id, name, photo)
+            else:
+                file_id = drive_resumable_upload(
+                    creds, folder_id, name, photo, info.file_size
+                )
+        manifest.add(info, destination, file_id)
+
+    with open_per_thread(zip_path) as open_entry, ThreadPoolExecutor(
+        max_workers=concurrency
+    ) as executor:
+        futures = [executor.submit(upload_one, info) for info in files]
+        progress = tqdm(
+            as_completed(futures), total=len(futures), desc="Drive", position=position
+        )
+        for future in progress:
+            future.result()
+
+
+def fresh_token(creds: Credentials) -> str:
+    """Returns the access token of ``creds``, refreshing it if it has expired."""
+    # pylint: disable=import-outside-toplevel
+    from google.auth.transport.requests import Request
+
+    with _REFRESH_LOCK:
+        if not creds.valid:
+            creds.refresh(Request())
+    return creds.token
+
+
+def _load_album_cache() -> Dict[str, str]:
+    """Returns the locally cached album IDs, keyed by lowercased album name."""
+    try:
+        with open(ALBUM_CACHE_PATH, "r", encoding="utf-8") as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_album_cache(cache: Dict[str, str]) -> None:
+    """Writes the album ID cache back to disk, if it is writable."""
+    _write_cache_file(ALBUM_CACHE_PATH, json.dumps(cache))
+
+
+def cache_album_id(album_name: str, album_id: str) -> None:
+    """Remembers an album's ID so later runs can skip the album lookup."""
+    cache = _load_album_cache()
+    cache[album_name.lower()] = album_id
+    _save_album_cache(cache)
+
+
+def forget_album_id(album_name: str) -> None:
+    """Drops an album's cached ID, so the next lookup lists albums again."""
+    cache = _load_album_cache()
+    if cache.pop(album_name.lower(), None) is not None:
+        _save_album_cache(cache)
 
 
 def find_album_by_name(service: Resource, album_name: str) -> Dict[str, Any]:
     """Search for a Google Photos album by name.
 
+    Albums found on a previous run are looked up by their cached ID instead
+    of listing every album. If that ID is rejected, e.g. because the album
+    was deleted, it is dropped from the cache and the albums are listed.
+
     Args:
         service (Resource): Authenticated Google Photos service object.
         album_name (str): Name of the album to search for.
@@ -102,12 +601,24 @@ def find_album_by_name(service: Resource, album_name: str) -> Dict[str, Any]:
     Raises:
         AlbumNotFoundError: If the album is not found.
     """
+    # pylint: disable=import-outside-toplevel
+    from googleapiclient.errors import HttpError
+
+    album_name_lower = album_name.lower()
+    cached_id = _load_album_cache().get(album_name_lower)
+    if cached_id:
+        try:
+            return service.albums().get(albumId=cached_id).execute()
+        except HttpError:
+            forget_album_id(album_name)
+
     try:
         results = service.albums().list(pageSize=50).execute()
 
         while True:
             for album in results.get("albums", []):
-                if album["title"].lower() == album_name.lower():
+                if album["title"].lower() == album_name_lower:
+                    cache_album_id(album_name, album["id"])
                     return album
 
             # Check for next page
@@ -127,50 +638,218 @@ def find_album_by_name(service: Resource, album_name: str) -> Dict[str, Any]:
         raise
 
 
-def upload_files_to_google_photos(
-    token: str, album_details: Dict[str, Any], directory: str
-) -> None:
-    """Uploads files from a directory to a Google Photos album."""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-type": "application/octet-stream",
-        "X-Goog-Upload-Content-Type": "image/jpeg",
-        "X-Goog-Upload-Protocol": "raw",
-    }
+def get_or_create_album(service: Resource, album_name: str) -> Dict[str, Any]:
+    """Returns the Google Photos album with the given name, creating it if needed."""
+    try:
+        return find_album_by_name(service, album_name)
+    except ValueError:
+        print(f"Album '{album_name}' not found. Creating a new album...")
+        create_body = {"album": {"title": album_name}}
+        album = service.albums().create(body=create_body).execute()
+        cache_album_id(album_name, album["id"])
+        return album
 
-    files = [f for f in os.listdir(directory) if f.endswith(".jpg")]
-    print(f"Uploading {len(files)} files to Google Photos...")
 
-    for filename in tqdm(files, desc="Uploading"):
-        file_path = os.path.join(directory, filename)
+class MediaItemsError(RuntimeError):
+    """Raised when only some photos could be added to a Google Photos album.
 
-        # Upload the photo bytes to get an upload token
-        with open(file_path, "rb") as photo:
-            upload_response = requests.post(
-                "https://photoslibrary.googleapis.com/v1/uploads",
-                headers=headers,
-                data=photo,
-                timeout=120,
-            )
-            upload_response.raise_for_status()
-            upload_token = upload_response.content.decode("utf-8")
+    ``media_item_ids`` maps the upload token of each photo that was added to
+    its media item ID, so callers can still record those.
+    """
+
+    def __init__(self, message: str, media_item_ids: Dict[str, str]):
+        super().__init__(message)
+        self.media_item_ids = media_item_ids
+
+
+def create_media_items(
+    creds: Credentials, album_id: str, uploads: List[Tuple[str, str]]
+) -> Dict[str, str]:
+    """Adds uploaded photos to a Google Photos album with a single batchCreate.
+
+    Args:
+        creds (Credentials): Google credentials, refreshed when expired.
+        album_id (str): ID of the album to add the photos to.
+        uploads (List[Tuple[str, str]]): Up to ``BATCH_CREATE_SIZE``
+            ``(filename, upload_token)`` pairs.
+
+    Returns:
+        Dict[str, str]: Media item ID for each upload token.
+
+    Raises:
+        HTTPError: If the first request fails.
+        MediaItemsError: If some items were added but others still fail
+            after ``MAX_RETRIES`` retries, or a retry fails.
+    """
+    media_item_ids: Dict[str, str] = {}
+    pending = list(uploads)
+
+    for attempt in range(MAX_RETRIES + 1):
+        if attempt:
+            time.sleep(2**attempt)
 
-        # Create a media item in Google Photos using the upload token
         create_body = {
             "newMediaItems": [
-                {"description": "", "simpleMediaItem": {"uploadToken": upload_token}}
+                {
+                    "description": "",
+                    "simpleMediaItem": {
+                        "uploadToken": upload_token,
+                        "fileName": filename,
+                    },
+                }
+                for filename, upload_token in pending
             ],
-            "albumId": album_details["id"],
+            "albumId": album_id,
         }
-
-        response = requests.post(
+        response = _SESSION.post(
             "https://photoslibrary.googleapis.com/v1/mediaItems:batchCreate",
-            headers={"Authorization": f"Bearer {token}"},
+            headers={"Authorization": f"Bearer {fresh_token(creds)}"},
             json=create_body,
             timeout=120,
         )
-        if response.status_code != 200:
-            raise HTTPError(response, response.json())
+        # 207 means some, but not all, of the items were created
+        if response.status_code not in (200, 207):
+            error = HTTPError(response, response.json())
+            if not media_item_ids:
+                raise error
+            raise MediaItemsError(
+                f"Failed to add {len(pending)} photos to the album", media_item_ids
+            ) from error
+
+        # Retry only the failed items; a token without a result counts as failed
+        results = {
+            result.get("uploadToken"): result
+            for result in response.json().get("newMediaItemResults", [])
+        }
+        failed = []
+        for filename, upload_token in pending:
+            result = results.get(upload_token, {})
+            if "mediaItem" in result and result.get("status", {}).get("code", 0) == 0:
+                media_item_ids[upload_token] = result["mediaItem"]["id"]
+            else:
+                failed.append((filename, upload_token))
+        pending = failed
+        if not pending:
+            return media_item_ids
+
+    names = ", ".join(filename for filename, _ in pending)
+    raise MediaItemsError(
+        f"Failed to add {len(pending)} photos to the album: {names}", media_item_ids
+    )
+
+
+def upload_files_to_google_photos(  # pylint: disable=too-many-arguments,too-many-locals
+    creds: Credentials,
+    album_details: Dict[str, Any],
+    zip_path: str,
+    photos: List[zipfile.ZipInfo],
+    *,
+    manifest: UploadManifest,
+    concurrency: int = 4,
+    position: Optional[int] = None,
+) -> None:
+    """Uploads JPEG entries of a ZIP file to a Google Photos album.
+
+    ``photos`` are streamed straight out of the archive, skipping photos
+    already recorded in ``manifest``. Photo bytes are uploaded on a pool of
+    ``concurrency`` threads, each with its own handle on the archive, sharing
+    one keep-alive session. As upload tokens come back they are added to the
+    album ``BATCH_CREATE_SIZE`` at a time, the maximum ``batchCreate``
+    accepts, and recorded in ``manifest``. A failed upload is raised only
+    once the rest have been added, so a re-run skips them. ``position`` pins
+    the progress bar to a line when another pass runs alongside.
+    """
+    destination = f"photos:{album_details['id']}"
+    files = [info for info in photos if not manifest.is_uploaded(info, destination)]
+    tqdm.write(f"Uploading {len(files)} new files to Google Photos...")
+
+    def upload_one(info: zipfile.ZipInfo) -> str:
+        # Upload the photo bytes to get an upload token
+        with open_entry(info) as photo:
+            upload_response = _SESSION.post(
+                "https://photoslibrary.googleapis.com/v1/uploads",
+                # Built per request, as a pass can outlive an access token
+                headers={
+                    "Authorization": f"Bearer {fresh_token(creds)}",
+                    "Content-type": "application/octet-stream",
+                    "X-Goog-Upload-Content-Type": "image/jpeg",
+                    "X-Goog-Upload-Protocol": "raw",
+                },
+                data=photo,
+                timeout=120,
+            )
+            upload_response.raise_for_status()
+            return upload_response.content.decode("utf-8")
+
+    def record(batch: List[Tuple[zipfile.ZipInfo, str]], ids: Dict[str, str]) -> None:
+        for info, upload in batch:
+            if upload in ids:
+                manifest.add(info, destination, ids[upload])
+
+    def add_to_album(batch: List[Tuple[zipfile.ZipInfo, str]]) -> None:
+        try:
+            media_item_ids = create_media_items(
+                creds,
+                album_details["id"],
+                [(os.path.basename(info.filename), upload) for info, upload in batch],
+            )
+        except MediaItemsError as error:
+            # Photos already in the album must not be uploaded again next run
+            record(batch, error.media_item_ids)
+            raise
+        except HTTPError:
+            # The album may be gone; don't trust its cached ID next run
+            forget_album_id(album_details["title"])
+            raise
+        record(batch, media_item_ids)
+
+    batch: List[Tuple[zipfile.ZipInfo, str]] = []
+    errors: List[Exception] = []
+
+    def flush() -> None:
+        try:
+            add_to_album(batch)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            errors.append(error)
+        batch.clear()
+
+    # Failures are collected rather than raised straight away, so photos that
+    # did upload still reach the album and the manifest
+    with open_per_thread(zip_path) as open_entry, ThreadPoolExecutor(
+        max_workers=concurrency
+    ) as executor:
+        futures = {executor.submit(upload_one, info): info for info in files}
+        progress = tqdm(
+            as_completed(futures), total=len(futures), desc="Photos", position=position
+        )
+        for future in progress:
+            try:
+                batch.append((futures[future], future.result()))
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                errors.append(error)
+                continue
+            if len(batch) == BATCH_CREATE_SIZE:
+                flush()
+    if batch:
+        flush()
+    if errors:
+        raise errors[0]
+
+
+def parse_gallery_url(gallery_url: str) -> Tuple[str, str]:
+    """Extracts the gallery and album IDs from an Adobe Lightroom gallery URL.
+
+    Args:
+        gallery_url (str): The Adobe Lightroom gallery URL in the format:
+                'https://lightroom.adobe.com/gallery/[gallery_id]/albums/[album_id]/assets'
+
+    Returns:
+        Tuple[str, str]: The gallery ID and album ID.
+    """
+    match = GALLERY_URL_RE.match(gallery_url)
+    if not match:
+        raise ValueError(f"Invalid gallery URL format: {gallery_url}")
+    return match[1], match[2]
 
 
 def generate_download_url(gallery_url: str) -> str:
@@ -183,17 +862,12 @@ def generate_download_url(gallery_url: str) -> str:
     Returns:
         str: The corresponding download URL.
     """
-    parts = gallery_url.split("/")
-    if len(parts) >= 8 and parts[2] == "lightroom.adobe.com" and parts[3] == "gallery":
-        gallery_id = parts[4]
-        album_id = parts[6]
-        download_url = (
-            f"https://dl.lightroom.adobe.com/spaces/{gallery_id}/"
-            f"albums/{album_id}?fullsize=true"
-        )
-        return download_url
-
-    raise ValueError(f"Invalid gallery URL format: {gallery_url}")
+    gallery_id, album_id = parse_gallery_url(gallery_url)
+    download_url = (
+        f"https://dl.lightroom.adobe.com/spaces/{gallery_id}/"
+        f"albums/{album_id}?fullsize=true"
+    )
+    return download_url
 
 
 @click.command()
@@ -210,47 +884,110 @@ def generate_download_url(gallery_url: str) -> str:
     default=None,
     help="The name of the Google Photos album to upload to.",
 )
-def main(
+@click.option(
+    "--concurrency",
+    default=4,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="The number of files to upload in parallel.",
+)
+def main(  # pylint: disable=too-many-locals
     gallery_url: str,
     folder_id: str = None,
     album_name: str = None,
+    concurrency: int = 4,
 ) -> None:
     """
-    Main function to orchestrate the download, extraction, and uploading process.
+    Main function to orchestrate the download and uploading process.
     Checks for the existence of 'token.json' and runs setup if it doesn't exist.
+    Authentication and the album lookup run while the gallery downloads, and
+    the Drive and Photos uploads run concurrently.
     """
     if not folder_id and not album_name:
         raise ValueError("At least one of folder_id or album_name must be specified.")
 
+    _SESSION.adapters["https://"].close()
+    _SESSION.mount("https://", make_http_adapter(concurrency))
+
     try:
+        gallery_id, gallery_album_id = parse_gallery_url(gallery_url)
         download_url = generate_download_url(gallery_url)
     except ValueError as e:
         print(f"Error: {e}")
         return
 
-    with tempfile.TemporaryDirectory() as extract_to:
-        print("Downloading and extracting ZIP file...")
-        download_and_extract_zip(download_url, extract_to)
-        print(f"Download and extraction complete. Files saved to {extract_to}")
+    stop_download = threading.Event()
+    downloader = ThreadPoolExecutor(max_workers=1)
+    with tempfile.TemporaryDirectory() as download_dir:
+        try:
+            print("Downloading ZIP file...")
+            zip_path = os.path.join(download_dir, "gallery.zip")
+            download = downloader.submit(
+                download_zip, download_url, zip_path, stop_download
+            )
 
-        if folder_id:
-            print(f"Uploading to Google Drive folder {folder_id}...")
-            drive_service = get_google_service("drive", "v3")
-            upload_files_to_drive(drive_service, folder_id, extract_to)
+            # Sign in and resolve the album while the gallery downloads
+            creds = get_google_credentials()
+            if album_name:
+                album_details = get_or_create_album(
+                    get_google_service("photoslibrary", "v1"), album_name
+                )
 
-        if album_name:
-            print(f"Uploading to Google Photos album {album_name}...")
-            photos_service = get_google_service("photoslibrary", "v1")
-            token = get_google_token()
             try:
-                album_details = find_album_by_name(photos_service, album_name)
-            except ValueError:
-                print(f"Album '{album_name}' not found. Creating a new album...")
-                create_body = {"album": {"title": album_name}}
-                response = photos_service.albums().create(body=create_body).execute() # pylint: disable=no-member
-                album_details = response["id"]
-
-            upload_files_to_google_photos(token, album_details, extract_to)
+                download.result()
+            except requests.exceptions.RequestException as e:
+                print(f"Error: {e}")
+                return
+        except BaseException:
+            # Report sign-in errors and Ctrl+C now, not once the gallery is in
+            stop_download.set()
+            raise
+        finally:
+            downloader.shutdown(wait=False, cancel_futures=True)
+        print(f"Download complete. Archive saved to {zip_path}")
+
+        with zipfile.ZipFile(zip_path) as zip_file:
+            photos = list_jpegs(zip_file)
+
+        # Drive and Photos are independent, so upload to both at the same time
+        with closing(
+            UploadManifest(gallery_id, gallery_album_id)
+        ) as manifest, ThreadPoolExecutor(max_workers=2) as destinations:
+            uploads = []
+            # Give each bar its own line only when both are drawn at once
+            both = bool(folder_id and album_name)
+            if folder_id:
+                tqdm.write(f"Uploading to Google Drive folder {folder_id}...")
+                uploads.append(
+                    destinations.submit(
+                        upload_files_to_drive,
+                        creds,
+                        folder_id,
+                        zip_path,
+                        photos,
+                        manifest=manifest,
+                        concurrency=concurrency,
+                        position=0 if both else None,
+                    )
+                )
+
+            if album_name:
+                tqdm.write(f"Uploading to Google Photos album {album_name}...")
+                uploads.append(
+                    destinations.submit(
+                        upload_files_to_google_photos,
+                        creds,
+                        album_details,
+                        zip_path,
+                        photos,
+                        manifest=manifest,
+                        concurrency=concurrency,
+                        position=1 if both else None,
+                    )
+                )
+
+            for upload in uploads:
+                upload.result()
 
         print("Done!")
 
@@ -0,0 +1,384 @@
+"""Tests for lightroom_to_google."""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+import lightroom_to_google
+
+
+class FlakyUploadHandler(BaseHTTPRequestHandler):
+    """Fake Drive upload endpoint that fails the first PUT with a 503."""
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Opens an upload session."""
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        host, port = self.server.server_address
+        self.send_header("Location", f"http://{host}:{port}/session")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        """Fails the first upload attempt and accepts the next one."""
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.puts.append((self.headers["Content-Range"], body))
+        if len(self.server.puts) == 1:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        payload = json.dumps({"id": "file-id"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class OpenPerThreadTest(unittest.TestCase):
+    """Tests for open_per_thread."""
+
+    def test_entry_is_sized_without_reading_it(self):
+        """requests takes a ZIP entry's length from its size, not by reading it."""
+        photo_bytes = os.urandom(64 * 1024)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = os.path.join(tmp_dir, "gallery.zip")
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+                zip_file.writestr("photo.jpg", photo_bytes)
+                info = zip_file.getinfo("photo.jpg")
+            with lightroom_to_google.open_per_thread(zip_path) as open_entry:
+                with open_entry(info) as photo:
+                    with mock.patch.object(
+                        zipfile.ZipExtFile, "read", side_effect=AssertionError
+                    ):
+                        request = requests.Request(
+                            "PUT", "http://localhost/", data=photo
+                        ).prepare()
+                    self.assertEqual(
+                        request.headers["Content-Length"], str(len(photo_bytes))
+                    )
+                    photo.seek(1000)
+                    request = requests.Request(
+                        "PUT", "http://localhost/", data=photo
+                    ).prepare()
+                    self.assertEqual(
+                        request.headers["Content-Length"], str(len(photo_bytes) - 1000)
+                    )
+
+
+class DriveResumableUploadTest(unittest.TestCase):
+    """Tests for drive_resumable_upload."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyUploadHandler)
+        self.server.puts = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        host, port = self.server.server_address
+        session = requests.Session()
+        session.mount("http://", lightroom_to_google.make_http_adapter(1))
+        for name, value in [
+            ("_SESSION", session),
+            ("DRIVE_RESUMABLE_UPLOAD_URL", f"http://{host}:{port}/upload"),
+        ]:
+            patcher = mock.patch.object(lightroom_to_google, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_retry_after_503_resends_whole_photo(self):
+        """A 503 on the upload PUT is retried with the photo rewound."""
+        photo_bytes = os.urandom(256 * 1024)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = os.path.join(tmp_dir, "gallery.zip")
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+                zip_file.writestr("photo.jpg", photo_bytes)
+            with zipfile.ZipFile(zip_path) as zip_file, zip_file.open(
+                "photo.jpg"
+            ) as photo:
+                file_id = lightroom_to_google.drive_resumable_upload(
+                    mock.Mock(valid=True, token="token"),
+                    "folder-id",
+                    "photo.jpg",
+                    photo,
+                    len(photo_bytes),
+                )
+
+        self.assertEqual(file_id, "file-id")
+        content_range = f"bytes 0-{len(photo_bytes) - 1}/{len(photo_bytes)}"
+        self.assertEqual(
+            self.server.puts,
+            [(content_range, photo_bytes), (content_range, photo_bytes)],
+        )
+
+
+def batch_create_response(status_code, results):
+    """Returns a fake batchCreate response holding ``results``."""
+    return mock.Mock(
+        status_code=status_code,
+        json=mock.Mock(return_value={"newMediaItemResults": results}),
+    )
+
+
+def created(upload_token):
+    """Returns a batchCreate result for an item that was added."""
+    return {
+        "uploadToken": upload_token,
+        "status": {"message": "Success"},
+        "mediaItem": {"id": f"id-{upload_token}"},
+    }
+
+
+def failed(upload_token):
+    """Returns a batchCreate result for an item that was not added."""
+    return {"uploadToken": upload_token, "status": {"code": 3, "message": "Failed"}}
+
+
+class CreateMediaItemsTest(unittest.TestCase):
+    """Tests for create_media_items."""
+
+    uploads = [("a.jpg", "token-a"), ("b.jpg", "token-b"), ("c.jpg", "token-c")]
+
+    def setUp(self):
+        self.session = mock.Mock()
+        for name, value in [
+            ("_SESSION", self.session),
+            ("fresh_token", mock.Mock(return_value="token")),
+        ]:
+            patcher = mock.patch.object(lightroom_to_google, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(lightroom_to_google.time, "sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sent_tokens(self, call):
+        """Returns the upload tokens sent by one batchCreate call."""
+        return [
+            item["simpleMediaItem"]["uploadToken"]
+            for item in call.kwargs["json"]["newMediaItems"]
+        ]
+
+    def test_retries_only_failed_items(self):
+        """Items that failed in a 207 are retried on their own."""
+        self.session.post.side_effect = [
+            batch_create_response(
+                207, [created("token-a"), failed("token-b"), created("token-c")]
+            ),
+            batch_create_response(200, [created("token-b")]),
+        ]
+
+        media_item_ids = lightroom_to_google.create_media_items(
+            "creds", "album-id", self.uploads
+        )
+
+        self.assertEqual(
+            media_item_ids,
+            {"token-a": "id-token-a", "token-b": "id-token-b", "token-c": "id-token-c"},
+        )
+        first, second = self.session.post.call_args_list
+        self.assertEqual(self.sent_tokens(first), ["token-a", "token-b", "token-c"])
+        self.assertEqual(self.sent_tokens(second), ["token-b"])
+
+    def test_results_are_matched_by_upload_token(self):
+        """Results out of order, or missing, are matched by upload token."""
+        self.session.post.side_effect = [
+            batch_create_response(207, [created("token-c"), created("token-a")]),
+            batch_create_response(200, [created("token-b")]),
+        ]
+
+        media_item_ids = lightroom_to_google.create_media_items(
+            "creds", "album-id", self.uploads
+        )
+
+        self.assertEqual(media_item_ids["token-a"], "id-token-a")
+        self.assertEqual(media_item_ids["token-c"], "id-token-c")
+        self.assertEqual(
+            self.sent_tokens(self.session.post.call_args_list[1]), ["token-b"]
+        )
+
+    def test_items_still_failing_keep_created_ids(self):
+        """Giving up on some items still reports the ones that were added."""
+        self.session.post.return_value = batch_create_response(
+            207, [created("token-a"), failed("token-b"), created("token-c")]
+        )
+
+        with self.assertRaises(lightroom_to_google.MediaItemsError) as raised:
+            lightroom_to_google.create_media_items("creds", "album-id", self.uploads)
+
+        self.assertEqual(
+            raised.exception.media_item_ids,
+            {"token-a": "id-token-a", "token-c": "id-token-c"},
+        )
+        self.assertEqual(
+            self.session.post.call_count, lightroom_to_google.MAX_RETRIES + 1
+        )
+
+    def test_failed_retry_keeps_created_ids(self):
+        """An error response on a retry still reports the items added before."""
+        self.session.post.side_effect = [
+            batch_create_response(207, [created("token-a"), failed("token-b")]),
+            batch_create_response(500, []),
+        ]
+
+        with self.assertRaises(lightroom_to_google.MediaItemsError) as raised:
+            lightroom_to_google.create_media_items(
+                "creds", "album-id", self.uploads[:2]
+            )
+
+        self.assertEqual(raised.exception.media_item_ids, {"token-a": "id-token-a"})
+
+    def test_failed_first_request_raises_http_error(self):
+        """An error response before anything was added is an HTTPError."""
+        self.session.post.return_value = batch_create_response(400, [])
+
+        with self.assertRaises(requests.HTTPError):
+            lightroom_to_google.create_media_items("creds", "album-id", self.uploads)
+
+
+def zip_info(filename, size, crc):
+    """Returns a ZipInfo as read from an archive's central directory."""
+    info = zipfile.ZipInfo(filename)
+    info.file_size = size
+    info.CRC = crc
+    return info
+
+
+class UploadManifestTest(unittest.TestCase):
+    """Tests for UploadManifest."""
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = os.path.join(tmp_dir.name, "manifest.db")
+        self.manifest = self.open_manifest("gallery", "album")
+
+    def open_manifest(self, gallery_id, album_id):
+        """Opens a manifest on the test database, closing it after the test."""
+        manifest = lightroom_to_google.UploadManifest(
+            gallery_id, album_id, path=self.path
+        )
+        self.addCleanup(manifest.close)
+        return manifest
+
+    def test_recorded_photo_is_uploaded(self):
+        """A photo recorded for a destination is skipped there next time."""
+        info = zip_info("sub/photo.jpg", 1000, 0x1234)
+        self.assertFalse(self.manifest.is_uploaded(info, "drive:folder"))
+
+        self.manifest.add(info, "drive:folder", "file-id")
+
+        self.assertTrue(self.manifest.is_uploaded(info, "drive:folder"))
+        # Entries are keyed by file name, not by the path inside the archive
+        self.assertTrue(
+            self.manifest.is_uploaded(
+                zip_info("other/photo.jpg", 1000, 0x1234), "drive:folder"
+            )
+        )
+
+    def test_changed_photo_is_not_uploaded(self):
+        """A different size or CRC means the photo has changed."""
+        self.manifest.add(zip_info("photo.jpg", 1000, 0x1234), "drive:folder", "id")
+
+        self.assertFalse(
+            self.manifest.is_uploaded(
+                zip_info("photo.jpg", 1001, 0x1234), "drive:folder"
+            )
+        )
+        self.assertFalse(
+            self.manifest.is_uploaded(
+                zip_info("photo.jpg", 1000, 0x4321), "drive:folder"
+            )
+        )
+
+    def test_other_destinations_are_separate(self):
+        """Uploads are tracked per destination, gallery and album."""
+        info = zip_info("photo.jpg", 1000, 0x1234)
+        self.manifest.add(info, "drive:folder", "file-id")
+
+        self.assertFalse(self.manifest.is_uploaded(info, "photos:album-id"))
+        self.assertFalse(self.manifest.is_uploaded(info, "drive:other-folder"))
+        self.assertFalse(
+            self.open_manifest("gallery", "other-album").is_uploaded(
+                info, "drive:folder"
+            )
+        )
+        self.assertTrue(
+            self.open_manifest("gallery", "album").is_uploaded(info, "drive:folder")
+        )
+
+    def test_re_adding_replaces_the_entry(self):
+        """A changed photo that is uploaded again replaces its old entry."""
+        self.manifest.add(zip_info("photo.jpg", 1000, 0x1234), "drive:folder", "old")
+        changed = zip_info("photo.jpg", 2000, 0x4321)
+
+        self.manifest.add(changed, "drive:folder", "new")
+
+        self.assertTrue(self.manifest.is_uploaded(changed, "drive:folder"))
+        self.assertFalse(
+            self.manifest.is_uploaded(
+                zip_info("photo.jpg", 1000, 0x1234), "drive:folder"
+            )
+        )
+
+
+class ParseGalleryUrlTest(unittest.TestCase):
+    """Tests for parse_gallery_url."""
+
+    def test_accepts_gallery_urls(self):
+        """Trailing slashes, queries, fragments and asset paths are allowed."""
+        for url in [
+            "https://lightroom.adobe.com/gallery/g1/albums/a1/assets",
+            "http://lightroom.adobe.com/gallery/g1/albums/a1/assets",
+            "https://lightroom.adobe.com/gallery/g1/albums/a1/assets/",
+            "https://lightroom.adobe.com/gallery/g1/albums/a1/assets?grid=small",
+            "https://lightroom.adobe.com/gallery/g1/albums/a1/assets#top",
+            "https://lightroom.adobe.com/gallery/g1/albums/a1/assets/asset-id",
+        ]:
+            with self.subTest(url=url):
+                self.assertEqual(
+                    lightroom_to_google.parse_gallery_url(url), ("g1", "a1")
+                )
+
+    def test_rejects_other_urls(self):
+        """Other hosts, schemes and paths are rejected."""
+        for url in [
+            "https://example.com/gallery/g1/albums/a1/assets",
+            "https://lightroom.adobe.com.example.com/gallery/g1/albums/a1/assets",
+            "https://example.com/?next=https://lightroom.adobe.com/gallery/g1"
+            "/albums/a1/assets",
+            "ftp://lightroom.adobe.com/gallery/g1/albums/a1/assets",
+            "https://lightroom.adobe.com/gallery/g1/albums/a1",
+            "https://lightroom.adobe.com/gallery/g1/albums/a1/assetsx",
+            "https://lightroom.adobe.com/gallery/g1/albums//assets",
+            "https://lightroom.adobe.com/gallery/g1/extra/albums/a1/assets",
+            "https://lightroom.adobe.com/shares/g1/albums/a1/assets",
+        ]:
+            with self.subTest(url=url):
+                with self.assertRaises(ValueError):
+                    lightroom_to_google.parse_gallery_url(url)
+
+    def test_download_url(self):
+        """The download URL is built from the gallery and album IDs."""
+        self.assertEqual(
+            lightroom_to_google.generate_download_url(
+                "https://lightroom.adobe.com/gallery/g1/albums/a1/assets/?x=1"
+            ),
+            "https://dl.lightroom.adobe.com/spaces/g1/albums/a1?fullsize=true",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()